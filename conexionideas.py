@@ -28,12 +28,19 @@ Métodos:
 - IdeaItem.update_size(event=None): Ajusta el tamaño del rectángulo basado en el texto contenido.
 - IdeaItem.keyPressEvent(event): Maneja teclas específicas para actualizar el tamaño del rectángulo o eliminarlo.
 - IdeaItem.mouseDoubleClickEvent(event): Permite editar el texto al hacer doble clic.
-- IdeaItem.mouseReleaseEvent(event): Actualiza las posiciones de las conexiones al soltar el ratón.
+- IdeaItem.mouseReleaseEvent(event): Actualiza las conexiones de las ideas arrastradas al soltar el ratón.
 - IdeaItem.set_color(color): Cambia el color del rectángulo.
 - IdeaItem.to_dict(): Serializa el objeto IdeaItem en un diccionario.
 - IdeaItem.from_dict(cls, data, window): Deserializa un objeto IdeaItem desde un diccionario.
 - ConnectionItem.update_position(): Actualiza la posición de la conexión según las posiciones de los rectángulos conectados.
-- ConnectionItem.draw_straight_connection(start_point, end_point): Dibuja una conexión recta entre dos rectángulos.
+  La ruta calculada se reutiliza mientras no se mueva ninguno de los extremos ni cambie el estilo o el carril.
+- ConnectionItem.set_style(style): Cambia el estilo de trazado de la conexión (recta, ortogonal o curva).
+- ConnectionItem.set_lane_offset(lane_offset): Asigna el carril de la conexión cuando hay varias entre las mismas ideas.
+- ConnectionItem.lane_normal(start_point, end_point): Calcula el vector unitario perpendicular hacia el que se desplazan los carriles.
+- ConnectionItem.draw_straight_connection(start_rect, end_rect): Dibuja una conexión recta recortada al borde de los rectángulos.
+- ConnectionItem.draw_orthogonal_connection(start_rect, end_rect): Dibuja una conexión con tramos horizontales y verticales
+  por el hueco entre las ideas (o recta si las ideas se solapan).
+- ConnectionItem.draw_curved_connection(start_rect, end_rect): Dibuja una conexión curva entre dos rectángulos.
 - ConnectionItem.draw_loop_connection(rect_center): Dibuja una conexión en bucle para conectar un rectángulo consigo mismo.
 - ConnectionItem.update_arrow_and_text(end_point, angle, midpoint=None): Actualiza la posición de la flecha y del texto.
 - ConnectionItem.keyPressEvent(event): Maneja la eliminación de la conexión al presionar la tecla de suprimir.
@@ -47,7 +54,11 @@ Métodos:
 - MainWindow.find_free_position(width, height): Encuentra una posición libre en la escena gráfica para colocar una nueva idea.
 - MainWindow.add_connection(): Añade una conexión entre dos ideas en la escena gráfica.
 - MainWindow.change_color(): Cambia el color de la idea seleccionada.
-- MainWindow.update_connections(): Actualiza todas las conexiones en la escena gráfica.
+- MainWindow.change_connection_style(index): Cambia el estilo de las nuevas conexiones y de las conexiones seleccionadas.
+- MainWindow.sync_style_combo(): Muestra en el desplegable el estilo de la conexión seleccionada.
+- MainWindow.update_connections(idea_items=None): Actualiza las conexiones de las ideas indicadas (o todas).
+- MainWindow.register_connection(connection_item): Añade una conexión al mapa y al índice de conexiones por idea.
+- MainWindow.assign_lanes(start_item, end_item): Separa en carriles paralelos las conexiones entre las mismas ideas.
 - MainWindow.remove_idea(idea_item): Elimina una idea y sus conexiones asociadas de la escena gráfica.
 - MainWindow.remove_connection(connection_item): Elimina una conexión de la escena gráfica.
 - MainWindow.clear_all(): Elimina todas las ideas y conexiones de la escena gráfica.
@@ -72,12 +83,51 @@ import json
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QWidget, QLineEdit, QPushButton, 
                              QGraphicsView, QGraphicsScene, QGraphicsRectItem, QGraphicsPathItem, 
                              QGraphicsTextItem, QLabel, QColorDialog, QAction, 
-                             QMessageBox, QFileDialog, QHBoxLayout, QSpacerItem, QSizePolicy, QToolBar, QTextEdit, QSystemTrayIcon, QMenu)
+                             QMessageBox, QFileDialog, QHBoxLayout, QSpacerItem, QSizePolicy, QToolBar, QTextEdit, QSystemTrayIcon, QMenu, QComboBox)
 from PyQt5.QtGui import QPen, QBrush, QFontMetrics, QPolygonF, QColor, QIntValidator, QPainterPath, QPainter, QPixmap, QIcon
 from PyQt5.QtCore import Qt, QRect, QRectF, QPointF
 from PyQt5.QtPrintSupport import QPrinter
 from pathlib import Path
 
+# Estilos de trazado disponibles para las conexiones (clave guardada en el JSON -> texto mostrado)
+CONNECTION_STYLES = {
+    "straight": "Recta",
+    "orthogonal": "Ortogonal",
+    "curved": "Curva",
+}
+DEFAULT_CONNECTION_STYLE = "straight"
+
+# Separación entre conexiones paralelas que unen las mismas dos ideas
+PARALLEL_EDGE_SPACING = 14
+
+# Devuelve el rectángulo de una idea en coordenadas de escena
+def scene_rect_of(item):
+    return item.rect().translated(item.pos())
+
+# Mantiene un punto dentro del rectángulo (para desplazar el origen de una conexión paralela)
+def clamp_to_rect(rect, point):
+    x = min(max(point.x(), rect.left()), rect.right())
+    y = min(max(point.y(), rect.top()), rect.bottom())
+    return QPointF(x, y)
+
+# Punto exacto donde el rayo que sale de 'origin' (dentro del rectángulo) hacia 'target' cruza el borde
+def clip_to_rect_border(rect, origin, target):
+    dx = target.x() - origin.x()
+    dy = target.y() - origin.y()
+    candidates = []
+    if dx > 0:
+        candidates.append((rect.right() - origin.x()) / dx)
+    elif dx < 0:
+        candidates.append((rect.left() - origin.x()) / dx)
+    if dy > 0:
+        candidates.append((rect.bottom() - origin.y()) / dy)
+    elif dy < 0:
+        candidates.append((rect.top() - origin.y()) / dy)
+    if not candidates:
+        return QPointF(origin)
+    t = max(0.0, min(candidates))
+    return QPointF(origin.x() + dx * t, origin.y() + dy * t)
+
 # Clase EditableTextItem
 class EditableTextItem(QGraphicsTextItem):
     def __init__(self, text, parent=None):
@@ -129,6 +179,8 @@ class IdeaItem(QGraphicsRectItem):
         new_height = max(50, text_rect.height() + 40)
         self.setRect(0, 0, new_width, new_height)
         self.text_item.setPos(10, 15)
+        # Las conexiones se recortan al borde exacto, así que deben seguir el nuevo tamaño
+        self.window.update_connections({self})
 
     def keyPressEvent(self, event):
         if event.key() in (Qt.Key_Return, Qt.Key_Enter):
@@ -148,7 +200,10 @@ class IdeaItem(QGraphicsRectItem):
 
     def mouseReleaseEvent(self, event):
         super().mouseReleaseEvent(event)
-        self.window.update_connections()
+        # Solo se recalculan las conexiones de las ideas arrastradas (incluida la selección múltiple)
+        moved_items = {item for item in self.scene().selectedItems() if isinstance(item, IdeaItem)}
+        moved_items.add(self)
+        self.window.update_connections(moved_items)
 
     def set_color(self, color):
         self.setBrush(QBrush(color))
@@ -170,48 +225,158 @@ class IdeaItem(QGraphicsRectItem):
 
 # Clase ConnectionItem
 class ConnectionItem(QGraphicsPathItem):
-    def __init__(self, start_item, end_item, scene, text="[Editar]"):
+    def __init__(self, start_item, end_item, scene, text="[Editar]", style=DEFAULT_CONNECTION_STYLE):
         super().__init__()
         self.start_item = start_item
         self.end_item = end_item
         self.arrow = None
         self.text_item = None
         self.connection_text = text
+        self.style = style
+        # Desplazamiento perpendicular que asigna MainWindow cuando varias conexiones unen las mismas ideas
+        self.lane_offset = 0
+        # Clave de la última ruta calculada: (rect. de inicio, rect. de fin, estilo, carril)
+        self.route_key = None
 
         self.setFlag(QGraphicsPathItem.ItemIsSelectable)
         self.setFlag(QGraphicsPathItem.ItemIsFocusable)
+        self.setPen(QPen(Qt.black, 2))
 
         scene.addItem(self)
         self.update_position()
 
+    def set_style(self, style):
+        self.style = style
+        self.update_position()
+
+    def set_lane_offset(self, lane_offset):
+        self.lane_offset = lane_offset
+        self.update_position()
+
     def update_position(self):
-        start_point = self.start_item.pos() + self.start_item.rect().center()
-        end_point = self.end_item.pos() + self.end_item.rect().center()
+        start_rect = scene_rect_of(self.start_item)
+        end_rect = scene_rect_of(self.end_item)
+
+        # La ruta solo se recalcula cuando se mueve (o cambia de tamaño) alguno de los extremos,
+        # o cuando cambia el estilo o el carril de la conexión
+        route_key = (start_rect.getRect(), end_rect.getRect(), self.style, self.lane_offset)
+        if route_key == self.route_key:
+            return
+        self.route_key = route_key
 
         if self.start_item == self.end_item:
-            self.draw_loop_connection(start_point)
+            self.draw_loop_connection(start_rect.center())
+        elif self.style == "orthogonal":
+            self.draw_orthogonal_connection(start_rect, end_rect)
+        elif self.style == "curved":
+            self.draw_curved_connection(start_rect, end_rect)
         else:
-            self.draw_straight_connection(start_point, end_point)
-
-        self.setPen(QPen(Qt.black, 2))
-        
-    def draw_straight_connection(self, start_point, end_point):
-        path = QPainterPath()
+            self.draw_straight_connection(start_rect, end_rect)
 
+    # Vector unitario perpendicular a la dirección inicio -> fin (hacia donde se desplazan los carriles)
+    def lane_normal(self, start_point, end_point):
         dx = end_point.x() - start_point.x()
         dy = end_point.y() - start_point.y()
-        angle = math.atan2(dy, dx)
+        length = math.hypot(dx, dy)
+        if length == 0:
+            return QPointF(0, 0)
+        return QPointF(-dy / length, dx / length)
+
+    def draw_straight_connection(self, start_rect, end_rect):
+        path = QPainterPath()
 
-        edge_offset = min(self.start_item.rect().width(), self.start_item.rect().height()) / 2
-        adjusted_start_point = start_point + QPointF(edge_offset * math.cos(angle), edge_offset * math.sin(angle))
+        start_center = start_rect.center()
+        end_center = end_rect.center()
+        shift = self.lane_normal(start_center, end_center) * self.lane_offset
 
-        edge_offset = min(self.end_item.rect().width(), self.end_item.rect().height()) / 2
-        adjusted_end_point = end_point - QPointF(edge_offset * math.cos(angle), edge_offset * math.sin(angle))
+        start_origin = clamp_to_rect(start_rect, start_center + shift)
+        end_origin = clamp_to_rect(end_rect, end_center + shift)
+
+        adjusted_start_point = clip_to_rect_border(start_rect, start_origin, end_origin)
+        adjusted_end_point = clip_to_rect_border(end_rect, end_origin, start_origin)
 
         path.moveTo(adjusted_start_point)
         path.lineTo(adjusted_end_point)
 
         self.setPath(path)
+
+        angle = math.atan2(adjusted_end_point.y() - adjusted_start_point.y(),
+                           adjusted_end_point.x() - adjusted_start_point.x())
+        self.update_arrow_and_text(adjusted_end_point, angle)
+
+    def draw_orthogonal_connection(self, start_rect, end_rect):
+        start_center = start_rect.center()
+        end_center = end_rect.center()
+        dx = end_center.x() - start_center.x()
+        dy = end_center.y() - start_center.y()
+
+        # Solo se enruta por un eje si las cajas están realmente separadas en ese eje
+        h_separated = start_rect.right() <= end_rect.left() or end_rect.right() <= start_rect.left()
+        v_separated = start_rect.bottom() <= end_rect.top() or end_rect.bottom() <= start_rect.top()
+
+        if h_separated and (not v_separated or abs(dx) >= abs(dy)):
+            # Sale y entra por los laterales, con el tramo vertical en el hueco entre ambas cajas
+            direction = 1 if dx >= 0 else -1
+            shift = self.lane_offset * direction
+            start_x = start_rect.right() if direction > 0 else start_rect.left()
+            end_x = end_rect.left() if direction > 0 else end_rect.right()
+            start_y = clamp_to_rect(start_rect, QPointF(start_x, start_center.y() + shift)).y()
+            end_y = clamp_to_rect(end_rect, QPointF(end_x, end_center.y() + shift)).y()
+            mid_x = min(max((start_x + end_x) / 2 + shift, min(start_x, end_x)), max(start_x, end_x))
+
+            points = [QPointF(start_x, start_y), QPointF(mid_x, start_y),
+                      QPointF(mid_x, end_y), QPointF(end_x, end_y)]
+        elif v_separated:
+            # Sale y entra por arriba/abajo, con el tramo horizontal en el hueco entre ambas cajas
+            direction = 1 if dy >= 0 else -1
+            shift = -self.lane_offset * direction
+            start_y = start_rect.bottom() if direction > 0 else start_rect.top()
+            end_y = end_rect.top() if direction > 0 else end_rect.bottom()
+            start_x = clamp_to_rect(start_rect, QPointF(start_center.x() + shift, start_y)).x()
+            end_x = clamp_to_rect(end_rect, QPointF(end_center.x() + shift, end_y)).x()
+            mid_y = min(max((start_y + end_y) / 2 + shift, min(start_y, end_y)), max(start_y, end_y))
+
+            points = [QPointF(start_x, start_y), QPointF(start_x, mid_y),
+                      QPointF(end_x, mid_y), QPointF(end_x, end_y)]
+        else:
+            # Las cajas se solapan en ambos ejes: no hay hueco para un trazado ortogonal
+            self.draw_straight_connection(start_rect, end_rect)
+            return
+
+        path = QPainterPath()
+        path.moveTo(points[0])
+        for point in points[1:]:
+            path.lineTo(point)
+        self.setPath(path)
+
+        # La flecha sigue la dirección del último tramo no nulo
+        adjusted_end_point = points[-1]
+        previous_point = next((point for point in reversed(points[:-1]) if point != adjusted_end_point), points[0])
+        angle = math.atan2(adjusted_end_point.y() - previous_point.y(),
+                           adjusted_end_point.x() - previous_point.x())
+        self.update_arrow_and_text(adjusted_end_point, angle)
+
+    def draw_curved_connection(self, start_rect, end_rect):
+        path = QPainterPath()
+
+        start_center = start_rect.center()
+        end_center = end_rect.center()
+        distance = math.hypot(end_center.x() - start_center.x(), end_center.y() - start_center.y())
+
+        # Curvatura base proporcional a la distancia; las conexiones paralelas se abren en abanico
+        bend = distance * 0.2 + 2 * self.lane_offset
+        control_point = (start_center + end_center) / 2 + self.lane_normal(start_center, end_center) * bend
+
+        adjusted_start_point = clip_to_rect_border(start_rect, start_center, control_point)
+        adjusted_end_point = clip_to_rect_border(end_rect, end_center, control_point)
+
+        path.moveTo(adjusted_start_point)
+        path.quadTo(control_point, adjusted_end_point)
+
+        self.setPath(path)
+
+        angle = math.atan2(adjusted_end_point.y() - control_point.y(),
+                           adjusted_end_point.x() - control_point.x())
         self.update_arrow_and_text(adjusted_end_point, angle)
 
     def draw_loop_connection(self, rect_center):
@@ -224,7 +389,8 @@ class ConnectionItem(QGraphicsPathItem):
         start_point = rect_center + start_offset
         end_point = rect_center + end_offset
 
-        loop_size = rect.width() * 0.75
+        # Cada bucle adicional sobre la misma idea se dibuja un carril más abajo
+        loop_size = rect.width() * 0.75 + self.lane_offset
 
         path.moveTo(start_point)
 
@@ -248,9 +414,10 @@ class ConnectionItem(QGraphicsPathItem):
         arrow_p3 = arrow_p1 - QPointF(arrow_size * math.cos(angle + math.pi / 6), arrow_size * math.sin(angle + math.pi / 6))
 
         arrow_head = QPolygonF([arrow_p1, arrow_p2, arrow_p3])
-        if self.arrow:
-            self.scene().removeItem(self.arrow)
-        self.arrow = self.scene().addPolygon(arrow_head, QPen(Qt.black), QBrush(Qt.black))
+        if self.arrow is None:
+            self.arrow = self.scene().addPolygon(arrow_head, QPen(Qt.black), QBrush(Qt.black))
+        else:
+            self.arrow.setPolygon(arrow_head)
 
         if midpoint is None:
             midpoint = self.path().pointAtPercent(0.5)
@@ -274,14 +441,16 @@ class ConnectionItem(QGraphicsPathItem):
         return {
             "start_item": self.start_item.number,
             "end_item": self.end_item.number,
-            "text": self.text_item.toPlainText()
+            "text": self.text_item.toPlainText(),
+            "style": self.style
         }
 
     @classmethod
     def from_dict(cls, data, scene, item_dict):
         start_item = item_dict[data['start_item']]
         end_item = item_dict[data['end_item']]
-        connection_item = cls(start_item, end_item, scene, data['text'])
+        style = data.get('style', DEFAULT_CONNECTION_STYLE)
+        connection_item = cls(start_item, end_item, scene, data['text'], style)
         return connection_item
 
 # Clase HelpWindow para mostrar las instrucciones
@@ -311,6 +480,8 @@ class HelpWindow(QWidget):
         <ul>
             <li>Para conectar dos ideas, introduce los números correspondientes a las ideas en los campos "Conectar de (número)" y "a (número)", y haz clic en "Añadir Conexión".</li>
             <li>Las conexiones se dibujarán como líneas entre las ideas, y puedes añadir texto a las conexiones haciendo doble clic en el texto "[Editar]".</li>
+            <li>En el desplegable "Estilo" puedes elegir si las conexiones se dibujan rectas, ortogonales o curvas. El estilo se aplica a las nuevas conexiones y a las conexiones seleccionadas.</li>
+            <li>Si conectas varias veces las mismas ideas, las conexiones se separan para que no se solapen.</li>
             <li>Los botones de las conexiones pueden verse utilizando en el botón desplegable del lado derecho. Este botón se muestra cuando no utilicemos la ventana a tamaño completo</li>
         </ul>
 
@@ -382,11 +553,15 @@ class MainWindow(QMainWindow):
         self.view = QGraphicsView()
         self.scene = QGraphicsScene(self)
         self.view.setScene(self.scene)
+        self.scene.selectionChanged.connect(self.sync_style_combo)
         self.setCentralWidget(self.view)
 
         self.idea_counter = 1
         self.ideas = []
         self.connections = []
+        # Índice idea -> conexiones que la tocan, para recalcular solo las rutas afectadas
+        self.connections_by_idea = {}
+        self.connection_style = DEFAULT_CONNECTION_STYLE
 
         self.initUI()
 
@@ -489,6 +664,16 @@ class MainWindow(QMainWindow):
         add_connection_btn.clicked.connect(self.add_connection)
         second_line_layout.addWidget(add_connection_btn)
 
+        style_label = QLabel("Estilo:")
+        second_line_layout.addWidget(style_label)
+
+        self.style_combo = QComboBox(self)
+        for style, label in CONNECTION_STYLES.items():
+            self.style_combo.addItem(label, style)
+        # 'activated' se emite aunque se elija el estilo ya mostrado, para poder aplicarlo a la selección
+        self.style_combo.activated.connect(self.change_connection_style)
+        second_line_layout.addWidget(self.style_combo)
+
         second_line_layout.addSpacerItem(QSpacerItem(40, 20, QSizePolicy.Expanding, QSizePolicy.Minimum))
 
         toolbar.addWidget(second_line_widget)
@@ -530,8 +715,8 @@ class MainWindow(QMainWindow):
             start_item = next(item for item in self.ideas if item.number == start_num)
             end_item = next(item for item in self.ideas if item.number == end_num)
 
-            connection_item = ConnectionItem(start_item, end_item, self.scene)
-            self.connections.append(connection_item)
+            connection_item = ConnectionItem(start_item, end_item, self.scene, style=self.connection_style)
+            self.register_connection(connection_item)
 
         except StopIteration:
             QMessageBox.warning(self, "Error", "Idea no encontrada.")
@@ -547,14 +732,57 @@ class MainWindow(QMainWindow):
                     if isinstance(item, IdeaItem):
                         item.set_color(color)
 
-    def update_connections(self):
-        for connection in self.connections:
+    # El estilo elegido se usa para las nuevas conexiones y se aplica a las conexiones seleccionadas
+    def change_connection_style(self, index):
+        self.connection_style = self.style_combo.itemData(index)
+        for item in self.scene.selectedItems():
+            if isinstance(item, ConnectionItem):
+                item.set_style(self.connection_style)
+
+    # Muestra en el desplegable el estilo de la conexión seleccionada
+    def sync_style_combo(self):
+        for item in self.scene.selectedItems():
+            if isinstance(item, ConnectionItem):
+                self.connection_style = item.style
+                self.style_combo.setCurrentIndex(self.style_combo.findData(item.style))
+                break
+
+    def update_connections(self, idea_items=None):
+        if idea_items is None:
+            connections = self.connections
+        else:
+            # Cada conexión se recalcula una sola vez aunque se hayan movido sus dos extremos
+            connections = {conn for idea in idea_items for conn in self.connections_by_idea.get(idea, [])}
+        for connection in connections:
             connection.update_position()
 
+    def register_connection(self, connection_item):
+        self.connections.append(connection_item)
+        for idea in {connection_item.start_item, connection_item.end_item}:
+            self.connections_by_idea.setdefault(idea, []).append(connection_item)
+        self.assign_lanes(connection_item.start_item, connection_item.end_item)
+
+    # Reparte en carriles paralelos las conexiones que unen las mismas dos ideas (o los bucles de una idea)
+    def assign_lanes(self, start_item, end_item):
+        pair = {start_item, end_item}
+        siblings = [conn for conn in self.connections_by_idea.get(start_item, [])
+                    if {conn.start_item, conn.end_item} == pair]
+        count = len(siblings)
+        for index, conn in enumerate(siblings):
+            if start_item == end_item:
+                lane_offset = index * PARALLEL_EDGE_SPACING
+            else:
+                lane_offset = (index - (count - 1) / 2) * PARALLEL_EDGE_SPACING
+                # Las conexiones en sentido contrario tienen la normal invertida; se compensa para no solaparse
+                if conn.start_item.number > conn.end_item.number:
+                    lane_offset = -lane_offset
+            conn.set_lane_offset(lane_offset)
+
     def remove_idea(self, idea_item):
         self.scene.removeItem(idea_item)
         self.ideas.remove(idea_item)
-        connections_to_remove = [conn for conn in self.connections if conn.start_item == idea_item or conn.end_item == idea_item]
+        # Se saca la idea del índice antes de borrar sus conexiones para no recolocar carriles que también desaparecen
+        connections_to_remove = self.connections_by_idea.pop(idea_item, [])
         for conn in connections_to_remove:
             self.remove_connection(conn)
 
@@ -563,12 +791,20 @@ class MainWindow(QMainWindow):
         self.scene.removeItem(connection_item.arrow)
         self.scene.removeItem(connection_item.text_item)
         self.connections.remove(connection_item)
+        pair = {connection_item.start_item, connection_item.end_item}
+        for idea in pair:
+            if idea in self.connections_by_idea:
+                self.connections_by_idea[idea].remove(connection_item)
+        # Solo se recolocan los carriles si las dos ideas siguen en el mapa
+        if all(idea in self.connections_by_idea for idea in pair):
+            self.assign_lanes(connection_item.start_item, connection_item.end_item)
 
     def clear_all(self):
         self.scene.clear()
         self.idea_counter = 1
         self.ideas = []
         self.connections = []
+        self.connections_by_idea = {}
 
     def save_file(self):
         options = QFileDialog.Options()
@@ -599,7 +835,7 @@ class MainWindow(QMainWindow):
                     self.idea_counter = max(self.idea_counter, idea_item.number + 1)
                 for connection_data in data["connections"]:
                     connection_item = ConnectionItem.from_dict(connection_data, self.scene, item_dict)
-                    self.connections.append(connection_item)
+                    self.register_connection(connection_item)
 
     def show_about(self):
         about_message_box = QMessageBox(self)